@@ -2,6 +2,7 @@
 
 import base64
 import mimetypes
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -23,6 +24,8 @@ class ContextBuilder:
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self._workspace_path = str(workspace.expanduser().resolve())
+        self._identity: str | None = None
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
@@ -44,11 +47,6 @@ class ContextBuilder:
         if bootstrap:
             parts.append(bootstrap)
         
-        # Memory context
-        memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
-        
         # Skills - progressive loading
         # 1. Always-loaded skills: include full content
         always_skills = self.skills.get_always_skills()
@@ -67,15 +65,26 @@ Skills with available="false" need dependencies installed first - you can try in
 
 {skills_summary}""")
         
+        # Frequently changing sections go last: everything before them stays
+        # byte-identical between turns, so providers can reuse their cached
+        # prompt prefix. The current time must stay the final section, since
+        # LiteLLMProvider places the Anthropic cache breakpoint just before it.
+        memory = self.memory.get_memory_context()
+        if memory:
+            parts.append(f"# Memory\n\n{memory}")
+        
+        parts.append(f"# Current Time\n{datetime.now().strftime('%Y-%m-%d %H:%M (%A)')}")
+        
         return "\n\n---\n\n".join(parts)
     
     def _get_identity(self) -> str:
         """Get the core identity section."""
-        from datetime import datetime
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        workspace_path = str(self.workspace.expanduser().resolve())
+        if self._identity is not None:
+            return self._identity
+        
+        workspace_path = self._workspace_path
         
-        return f"""# nanobot 🐈
+        identity = f"""# nanobot 🐈
 
 You are nanobot, a helpful AI assistant. You have access to tools that allow you to:
 - Read, write, and edit files
@@ -84,9 +93,6 @@ You are nanobot, a helpful AI assistant. You have access to tools that allow you
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now}
-
 ## Workspace
 Your workspace is at: {workspace_path}
 - Memory files: {workspace_path}/memory/MEMORY.md
@@ -99,6 +105,8 @@ For normal conversation, just respond with text - do not call the message tool.
 
 Always be helpful, accurate, and concise. When using tools, explain what you're doing.
 When remembering something, write to {workspace_path}/memory/MEMORY.md"""
+        self._identity = identity
+        return identity
     
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
@@ -174,6 +182,8 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         """
         Add a tool result to the message list.
         
+        The list is appended to in place; no copy is made.
+        
         Args:
             messages: Current message list.
             tool_call_id: ID of the tool call.
@@ -181,7 +191,7 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
             result: Tool execution result.
         
         Returns:
-            Updated message list.
+            The same message list, for chaining.
         """
         messages.append({
             "role": "tool",
@@ -200,13 +210,15 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         """
         Add an assistant message to the message list.
         
+        The list is appended to in place; no copy is made.
+        
         Args:
             messages: Current message list.
             content: Message content.
             tool_calls: Optional tool calls.
         
         Returns:
-            Updated message list.
+            The same message list, for chaining.
         """
         msg: dict[str, Any] = {"role": "assistant", "content": content or ""}
         
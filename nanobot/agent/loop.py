@@ -1,8 +1,10 @@
 """Agent loop: the core processing engine."""
 
 import asyncio
-import json
-from collections import Counter
+import sys
+import weakref
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +12,8 @@ from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.cache import PromptCache
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
@@ -19,8 +22,9 @@ from nanobot.agent.tools.web import WebSearchTool, WebFetchTool, OllamaWebSearch
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.subagent import SubagentManager
-from nanobot.session.manager import SessionManager
+from nanobot.session.manager import Session, SessionManager
 from nanobot.usage.tracker import UsageTracker
+from nanobot.utils.helpers import json_dumps
 
 
 class AgentLoop:
@@ -47,6 +51,10 @@ class AgentLoop:
         ollama_web_search_base_url: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         usage_alert_config: "UsageAlertConfig | None" = None,
+        prompt_cache_size: int = 128,
+        max_concurrent_messages: int = 4,
+        stream_tool_calls: bool = False,
+        max_turn_seconds: float = 300,
     ):
         from nanobot.config.schema import ExecToolConfig, UsageAlertConfig
         self.bus = bus
@@ -54,6 +62,8 @@ class AgentLoop:
         self.workspace = workspace
         self.model = model or provider.get_default_model()
         self.max_iterations = max_iterations
+        self.stream_tool_calls = stream_tool_calls
+        self.max_turn_seconds = max_turn_seconds
         self.brave_api_key = brave_api_key
         self.ollama_web_search_key = ollama_web_search_key
         self.ollama_web_search_base_url = ollama_web_search_base_url or "https://ollama.com"
@@ -64,6 +74,7 @@ class AgentLoop:
         self.sessions = SessionManager(workspace)
         self.tools = ToolRegistry()
         self.usage_tracker = UsageTracker()
+        self.prompt_cache = PromptCache(prompt_cache_size) if prompt_cache_size > 0 else None
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -74,6 +85,15 @@ class AgentLoop:
         )
         
         self._running = False
+        self._stop_event = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(max_concurrent_messages)
+        # Entries vanish once no task holds or waits on the lock
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._bg_tasks: set[asyncio.Task[None]] = set()
+        self._pending_saves: dict[str, asyncio.Task[None]] = {}
         self._register_default_tools()
     
     def _check_usage_alerts(self, session_key: str) -> str | None:
@@ -86,30 +106,27 @@ class AgentLoop:
         Returns:
             Warning message if limits exceeded, None otherwise.
         """
-        if not self.usage_alert_config.enabled:
+        alerts = self.usage_alert_config
+        if not alerts.enabled:
             return None
         
         warnings = []
         
-        # Check session limit
-        if self.usage_alert_config.session_limit > 0:
-            session_usage = self.usage_tracker.get_session(session_key)
-            if session_usage:
-                total = session_usage.get("total_tokens", 0)
-                if total > self.usage_alert_config.session_limit:
-                    warnings.append(
-                        f"⚠️  Session token limit exceeded: {total:,} / {self.usage_alert_config.session_limit:,} tokens"
-                    )
+        # Check session limit (reads the tracker's running totals, no dict copies)
+        if alerts.session_limit > 0:
+            total = self.usage_tracker.get_session_total(session_key)
+            if total > alerts.session_limit:
+                warnings.append(
+                    f"⚠️  Session token limit exceeded: {total:,} / {alerts.session_limit:,} tokens"
+                )
         
         # Check daily limit
-        if self.usage_alert_config.daily_limit > 0:
-            daily_usage = self.usage_tracker.get_daily()
-            if daily_usage:
-                total = daily_usage.get("total_tokens", 0)
-                if total > self.usage_alert_config.daily_limit:
-                    warnings.append(
-                        f"⚠️  Daily token limit exceeded: {total:,} / {self.usage_alert_config.daily_limit:,} tokens"
-                    )
+        if alerts.daily_limit > 0:
+            total = self.usage_tracker.get_daily_total()
+            if total > alerts.daily_limit:
+                warnings.append(
+                    f"⚠️  Daily token limit exceeded: {total:,} / {alerts.daily_limit:,} tokens"
+                )
         
         if warnings:
             logger.warning(f"Usage alert triggered for {session_key}: {'; '.join(warnings)}")
@@ -152,20 +169,191 @@ class AgentLoop:
         spawn_tool = SpawnTool(manager=self.subagents)
         self.tools.register(spawn_tool)
     
+    async def _cached_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        session_key: str,
+        usage: list[dict[str, Any]],
+        dispatched: dict[str, "asyncio.Task[str]"],
+        tool_ctx: dict[str, Any],
+    ) -> LLMResponse:
+        """
+        Call the LLM, short-circuiting identical requests via the prompt cache.
+        
+        Token usage is appended to `usage` for a single batched tracker update
+        per turn; cache hits are recorded as saved tokens rather than billed
+        prompt/completion tokens.
+        
+        When streaming, read-only tool calls are started as soon as their
+        arguments are complete and their tasks are stored in `dispatched` by
+        tool call id.
+        """
+        key = None
+        if self.prompt_cache is not None:
+            key = PromptCache.make_key(messages, tools, self.model)
+            cached = self.prompt_cache.get(key)
+            if cached is not None:
+                logger.debug(f"Prompt cache hit for {session_key}")
+                if cached.usage:
+                    usage.append({
+                        "session_key": session_key,
+                        "model": self.model,
+                        "prompt_tokens": 0,
+                        "completion_tokens": 0,
+                        "total_tokens": 0,
+                        "saved_tokens": cached.usage.get("total_tokens", 0),
+                    })
+                return cached
+        
+        if self.stream_tool_calls:
+            response = await self._stream_chat(messages, tools, dispatched, tool_ctx)
+        else:
+            response = await self.provider.chat(
+                messages=messages,
+                tools=tools,
+                model=self.model
+            )
+        
+        if response.usage:
+            usage.append({
+                "session_key": session_key,
+                "model": self.model,
+                "prompt_tokens": response.usage.get("prompt_tokens", 0),
+                "completion_tokens": response.usage.get("completion_tokens", 0),
+                "total_tokens": response.usage.get("total_tokens", 0),
+                "cached_tokens": response.usage.get("cached_tokens", 0),
+            })
+        
+        if key is not None:
+            self.prompt_cache.put(key, response)
+        return response
+    
+    async def _stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        dispatched: dict[str, "asyncio.Task[str]"],
+        tool_ctx: dict[str, Any],
+    ) -> LLMResponse:
+        """
+        Stream an LLM call, starting read-only tool calls as soon as they are complete.
+        
+        Calls with side effects are never started early, since the stream may
+        still fail or the final response may not request them. Once one is
+        seen, later calls wait too so they cannot overtake it.
+        """
+        response: LLMResponse | None = None
+        side_effects = False
+        try:
+            async for item in self.provider.chat_stream(
+                messages=messages, tools=tools, model=self.model
+            ):
+                if isinstance(item, LLMResponse):
+                    response = item
+                elif not self.tools.is_read_only(item.name):
+                    side_effects = True
+                elif item.id and not side_effects:
+                    # Overlap tool I/O with the rest of the generation
+                    logger.debug(f"Dispatching tool early: {item.name}")
+                    dispatched[item.id] = asyncio.create_task(
+                        self.tools.execute(item.name, item.arguments, tool_ctx)
+                    )
+        except BaseException:
+            for task in dispatched.values():
+                task.cancel()
+            raise
+        
+        if response is None:
+            response = LLMResponse(content="Error calling LLM: empty stream", finish_reason="error")
+        
+        # Drop anything the final response does not actually request
+        wanted = {tc.id for tc in response.tool_calls}
+        for tool_id in [i for i in dispatched if i not in wanted]:
+            dispatched.pop(tool_id).cancel()
+        return response
+    
+    async def _execute_tool_calls(
+        self,
+        tool_calls: list[ToolCallRequest],
+        tool_call_dicts: list[dict[str, Any]],
+        dispatched: dict[str, "asyncio.Task[str]"],
+        tool_ctx: dict[str, Any],
+    ) -> list[str]:
+        """
+        Execute the tool calls of one LLM response.
+        
+        Read-only calls run concurrently; calls with side effects run one at
+        a time in the order the LLM requested them.
+        
+        Args:
+            tool_calls: Tool calls requested by the LLM.
+            tool_call_dicts: The same calls in OpenAI format (serialized arguments).
+            dispatched: Tasks for calls already started while streaming.
+            tool_ctx: Per-call tool context (origin channel/chat_id).
+        
+        Returns:
+            Tool results, in the same order as tool_calls.
+        """
+        for tool_call, tc_dict in zip(tool_calls, tool_call_dicts):
+            # Reuse the arguments already serialized for the assistant message
+            args_str = tc_dict["function"]["arguments"]
+            logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
+        
+        return await self.tools.execute_many(
+            [(tc.name, tc.arguments) for tc in tool_calls],
+            tool_ctx,
+            [dispatched.pop(tc.id, None) for tc in tool_calls],
+        )
+    
     async def run(self) -> None:
         """Run the agent loop, processing messages from the bus."""
         self._running = True
+        self._stop_event.clear()
         logger.info("Agent loop started")
         
-        while self._running:
-            try:
-                # Wait for next message
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
+        # Block on the queue and the stop signal together instead of polling
+        stop_task = asyncio.create_task(self._stop_event.wait())
+        try:
+            while self._running:
+                msg_task = asyncio.create_task(self.bus.consume_inbound())
+                done, _ = await asyncio.wait(
+                    {msg_task, stop_task},
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
+                if msg_task not in done:
+                    msg_task.cancel()
+                    break
                 
-                # Process it
+                # Process it concurrently; per-session order is kept by _dispatch
+                task = asyncio.create_task(self._dispatch(msg_task.result()))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            stop_task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.drain()
+    
+    def _session_lock(self, session_key: str) -> asyncio.Lock:
+        """Get the lock that serializes processing for a session."""
+        lock = self._session_locks.get(session_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_key] = lock
+        return lock
+    
+    async def _dispatch(self, msg: InboundMessage) -> None:
+        """Process one inbound message and publish the response."""
+        # System messages are routed to their origin session ("channel:chat_id")
+        if msg.channel == "system":
+            session_key = sys.intern(":".join(self._parse_origin(msg.chat_id)))
+        else:
+            session_key = msg.session_key
+        
+        async with self._session_lock(session_key):
+            await self._wait_for_save(session_key)
+            async with self._semaphore:
                 try:
                     response = await self._process_message(msg)
                     if response:
@@ -178,12 +366,48 @@ class AgentLoop:
                         chat_id=msg.chat_id,
                         content=f"Sorry, I encountered an error: {str(e)}"
                     ))
-            except asyncio.TimeoutError:
-                continue
+    
+    def _spawn_background(self, coro: Any) -> asyncio.Task[None]:
+        """Run post-reply work (e.g. persistence) without delaying the response."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+    
+    def _schedule_save(self, session: Session) -> None:
+        """Persist a session in the background; its next turn waits for the write."""
+        task = self._spawn_background(self._save_session(session))
+        self._pending_saves[session.key] = task
+        task.add_done_callback(partial(self._forget_save, session.key))
+    
+    def _forget_save(self, session_key: str, task: asyncio.Task[None]) -> None:
+        if self._pending_saves.get(session_key) is task:
+            del self._pending_saves[session_key]
+    
+    async def _wait_for_save(self, session_key: str) -> None:
+        """Wait for the session's pending save so the next turn cannot mutate it mid-write."""
+        save = self._pending_saves.get(session_key)
+        if save is not None:
+            # asyncio.wait() does not cancel the write if this waiter is cancelled
+            await asyncio.wait({save})
+    
+    async def _save_session(self, session: Session) -> None:
+        """Persist a session off the event loop."""
+        try:
+            await asyncio.to_thread(self.sessions.save, session)
+        except Exception as e:
+            logger.error(f"Failed to save session {session.key}: {e}")
+    
+    async def drain(self) -> None:
+        """Wait for background work to finish and flush usage statistics."""
+        while self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        self.usage_tracker.flush()
     
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
+        self._stop_event.set()
         logger.info("Agent loop stopping")
     
     async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
@@ -196,91 +420,119 @@ class AgentLoop:
         Returns:
             The response message, or None if no response needed.
         """
-        # Handle system messages (subagent announces)
-        # The chat_id contains the original "channel:chat_id" to route back to
-        if msg.channel == "system":
-            return await self._process_system_message(msg)
+        # Bound the whole turn; on expiry in-flight LLM calls and tools are cancelled
+        try:
+            async with asyncio.timeout(self.max_turn_seconds):
+                # Handle system messages (subagent announces)
+                # The chat_id contains the original "channel:chat_id" to route back to
+                if msg.channel == "system":
+                    return await self._process_system_message(msg)
+                return await self._process_user_message(msg)
+        except TimeoutError:
+            logger.warning(f"Processing timed out after {self.max_turn_seconds:g}s: {msg.session_key}")
+            channel, chat_id = (
+                self._parse_origin(msg.chat_id) if msg.channel == "system"
+                else (msg.channel, msg.chat_id)
+            )
+            return OutboundMessage(
+                channel=channel,
+                chat_id=chat_id,
+                content=f"Sorry, processing timed out after {self.max_turn_seconds:g}s."
+            )
+    
+    async def _run_llm_loop(
+        self,
+        messages: list[dict[str, Any]],
+        session_key: str,
+        tool_ctx: dict[str, Any],
+    ) -> tuple[str | None, dict[str, int]]:
+        """
+        Run the LLM/tool-call loop until the model answers without tool calls.
         
-        logger.info(f"Processing message from {msg.channel}:{msg.sender_id}")
+        Args:
+            messages: Initial messages; extended in place with the exchange.
+            session_key: Session to attribute token usage to.
+            tool_ctx: Per-call tool context (where message/spawn tools deliver to).
         
-        # Track tool usage for this session
-        tool_calls_counter = Counter()
+        Returns:
+            The final content (None if max_iterations was reached) and a count
+            of tool calls per tool name.
+        """
+        tool_defs = self.tools.get_definitions()
+        usage_entries: list[dict[str, Any]] = []
+        tool_calls_counter: dict[str, int] = {}
+        iteration = 0
+        final_content = None
+        
+        try:
+            while iteration < self.max_iterations:
+                iteration += 1
+            
+                # Call LLM (usage is collected into usage_entries)
+                dispatched: dict[str, asyncio.Task[str]] = {}
+                response = await self._cached_chat(
+                    messages, tool_defs, session_key, usage_entries, dispatched, tool_ctx
+                )
+            
+                # Handle tool calls
+                if response.has_tool_calls:
+                    # Add assistant message with tool calls
+                    tool_call_dicts = [
+                        {
+                            "id": tc.id,
+                            "type": "function",
+                            "function": {
+                                "name": tc.name,
+                                "arguments": json_dumps(tc.arguments)  # Must be JSON string
+                            }
+                        }
+                        for tc in response.tool_calls
+                    ]
+                    self.context.add_assistant_message(
+                        messages, response.content, tool_call_dicts
+                    )
+                
+                    # Read-only tools run concurrently; results are added in call order
+                    results = await self._execute_tool_calls(
+                        response.tool_calls, tool_call_dicts, dispatched, tool_ctx
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
+                        self.context.add_tool_result(
+                            messages, tool_call.id, tool_call.name, result
+                        )
+                        # Track tool usage
+                        name = sys.intern(tool_call.name)
+                        tool_calls_counter[name] = tool_calls_counter.get(name, 0) + 1
+                else:
+                    # No tool calls, we're done
+                    final_content = response.content
+                    break
+        finally:
+            # Track token usage for the whole turn at once, even if it timed out
+            self.usage_tracker.track_batch(usage_entries)
+        
+        return final_content, tool_calls_counter
+    
+    async def _process_user_message(self, msg: InboundMessage) -> OutboundMessage | None:
+        """Process a message from a chat channel."""
+        logger.info(f"Processing message from {msg.channel}:{msg.sender_id}")
         
         # Get or create session
         session = self.sessions.get_or_create(msg.session_key)
         
-        # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(msg.channel, msg.chat_id)
-        
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(msg.channel, msg.chat_id)
-        
-        # Build initial messages (use get_history for LLM-formatted messages)
-        messages = self.context.build_messages(
+        # Build initial messages (use get_history for LLM-formatted messages).
+        # This reads bootstrap, memory, skill and media files, so keep it off the event loop.
+        messages = await asyncio.to_thread(
+            self.context.build_messages,
             history=session.get_history(),
             current_message=msg.content,
             media=msg.media if msg.media else None,
         )
         
         # Agent loop
-        iteration = 0
-        final_content = None
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            # Call LLM
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            # Track token usage
-            if response.usage:
-                self.usage_tracker.track(
-                    session_key=msg.session_key,
-                    model=self.model,
-                    prompt_tokens=response.usage.get("prompt_tokens", 0),
-                    completion_tokens=response.usage.get("completion_tokens", 0),
-                    total_tokens=response.usage.get("total_tokens", 0),
-                )
-            
-            # Handle tool calls
-            if response.has_tool_calls:
-                # Add assistant message with tool calls
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
-                
-                # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-                    # Track tool usage
-                    tool_calls_counter[tool_call.name] += 1
-            else:
-                # No tool calls, we're done
-                final_content = response.content
-                break
+        final_content, tool_calls_counter = await self._run_llm_loop(
+            messages, msg.session_key, {"channel": msg.channel, "chat_id": msg.chat_id}
+        )
         
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -294,14 +546,16 @@ class AgentLoop:
         if tool_calls_counter:
             tool_summary = ", ".join(
                 f"{name} ({count}x)" if count > 1 else name
-                for name, count in tool_calls_counter.most_common()
+                for name, count in sorted(
+                    tool_calls_counter.items(), key=itemgetter(1), reverse=True
+                )
             )
             logger.info(f"Tools used: {tool_summary}")
         
         # Save to session
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        self._schedule_save(session)
         
         return OutboundMessage(
             channel=msg.channel,
@@ -318,84 +572,23 @@ class AgentLoop:
         """
         logger.info(f"Processing system message from {msg.sender_id}")
         
-        # Parse origin from chat_id (format: "channel:chat_id")
-        if ":" in msg.chat_id:
-            parts = msg.chat_id.split(":", 1)
-            origin_channel = parts[0]
-            origin_chat_id = parts[1]
-        else:
-            # Fallback
-            origin_channel = "cli"
-            origin_chat_id = msg.chat_id
+        origin_channel, origin_chat_id = self._parse_origin(msg.chat_id)
         
         # Use the origin session for context
-        session_key = f"{origin_channel}:{origin_chat_id}"
+        session_key = sys.intern(f"{origin_channel}:{origin_chat_id}")
         session = self.sessions.get_or_create(session_key)
         
-        # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(origin_channel, origin_chat_id)
-        
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(origin_channel, origin_chat_id)
-        
         # Build messages with the announce content
-        messages = self.context.build_messages(
+        messages = await asyncio.to_thread(
+            self.context.build_messages,
             history=session.get_history(),
             current_message=msg.content
         )
         
         # Agent loop (limited for announce handling)
-        iteration = 0
-        final_content = None
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            # Track token usage for system messages
-            if response.usage:
-                self.usage_tracker.track(
-                    session_key=session_key,
-                    model=self.model,
-                    prompt_tokens=response.usage.get("prompt_tokens", 0),
-                    completion_tokens=response.usage.get("completion_tokens", 0),
-                    total_tokens=response.usage.get("total_tokens", 0),
-                )
-            
-            if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
-                
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                final_content = response.content
-                break
+        final_content, _ = await self._run_llm_loop(
+            messages, session_key, {"channel": origin_channel, "chat_id": origin_chat_id}
+        )
         
         if final_content is None:
             final_content = "Background task completed."
@@ -403,7 +596,7 @@ class AgentLoop:
         # Save to session (mark as system message in history)
         session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        self._schedule_save(session)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -411,6 +604,15 @@ class AgentLoop:
             content=final_content
         )
     
+    @staticmethod
+    def _parse_origin(chat_id: str) -> tuple[str, str]:
+        """Parse a system message's origin from its chat_id (format: "channel:chat_id")."""
+        if ":" in chat_id:
+            channel, origin_chat_id = chat_id.split(":", 1)
+            return channel, origin_chat_id
+        # Fallback
+        return "cli", chat_id
+    
     async def process_direct(self, content: str, session_key: str = "cli:direct") -> str:
         """
         Process a message directly (for CLI usage).
@@ -429,5 +631,7 @@ class AgentLoop:
             content=content
         )
         
-        response = await self._process_message(msg)
+        async with self._session_lock(msg.session_key):
+            await self._wait_for_save(msg.session_key)
+            response = await self._process_message(msg)
         return response.content if response else ""
@@ -1,7 +1,9 @@
 """Memory system for persistent agent memory."""
 
+import os
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta, time as dt_time
 
 from nanobot.utils.helpers import ensure_dir, today_date
 
@@ -17,41 +19,94 @@ class MemoryStore:
         self.workspace = workspace
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
+        self._today_date_str: str | None = None
+        self._today_path: Path | None = None
+        # Local-time bounds [start, end) of the day the two fields above refer to
+        self._today_bounds: tuple[float, float] = (0.0, 0.0)
+        # path -> (st_mtime_ns, st_size, content), revalidated with one stat per read
+        self._read_cache: dict[Path, tuple[int, int, str]] = {}
+    
+    # Maximum number of files kept in the read cache
+    READ_CACHE_SIZE = 32
     
     def get_today_file(self) -> Path:
         """Get path to today's memory file."""
-        return self.memory_dir / f"{today_date()}.md"
+        now = time.time()
+        start, end = self._today_bounds
+        if not start <= now < end:
+            date_str = today_date()
+            day = date.fromisoformat(date_str)
+            next_day = date.fromordinal(day.toordinal() + 1)
+            self._today_bounds = (
+                datetime.combine(day, dt_time()).timestamp(),
+                datetime.combine(next_day, dt_time()).timestamp(),
+            )
+            self._today_date_str = date_str
+            self._today_path = self.memory_dir / f"{date_str}.md"
+        return self._today_path
+    
+    def _cached_read(self, path: Path) -> str:
+        """
+        Read a memory file, reusing the cached content while it is unchanged.
+        
+        Files can also be edited by the agent's own tools, so every read still
+        stats the file; only the read itself is skipped on a hit.
+        
+        Args:
+            path: File to read.
+        
+        Returns:
+            File content, or an empty string if the file does not exist.
+        """
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._read_cache.pop(path, None)
+            return ""
+        
+        cached = self._read_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        content = path.read_text(encoding="utf-8")
+        if path not in self._read_cache and len(self._read_cache) >= self.READ_CACHE_SIZE:
+            # Evict the oldest entry
+            self._read_cache.pop(next(iter(self._read_cache)), None)
+        self._read_cache[path] = (st.st_mtime_ns, st.st_size, content)
+        return content
     
     def read_today(self) -> str:
         """Read today's memory notes."""
-        today_file = self.get_today_file()
-        if today_file.exists():
-            return today_file.read_text(encoding="utf-8")
-        return ""
+        return self._cached_read(self.get_today_file())
     
     def append_today(self, content: str) -> None:
         """Append content to today's memory notes."""
         today_file = self.get_today_file()
         
-        if today_file.exists():
-            existing = today_file.read_text(encoding="utf-8")
-            content = existing + "\n" + content
-        else:
-            # Add header for new day
-            header = f"# {today_date()}\n\n"
-            content = header + content
-        
-        today_file.write_text(content, encoding="utf-8")
+        with today_file.open("a", encoding="utf-8") as f:
+            if f.tell() == 0:
+                # Add header for new day
+                f.write(f"# {self._today_date_str}\n\n")
+            else:
+                f.write("\n")
+            f.write(content)
+        self._read_cache.pop(today_file, None)
     
     def read_long_term(self) -> str:
         """Read long-term memory (MEMORY.md)."""
-        if self.memory_file.exists():
-            return self.memory_file.read_text(encoding="utf-8")
-        return ""
+        return self._cached_read(self.memory_file)
     
     def write_long_term(self, content: str) -> None:
-        """Write to long-term memory (MEMORY.md)."""
-        self.memory_file.write_text(content, encoding="utf-8")
+        """
+        Write to long-term memory (MEMORY.md).
+        
+        The new content is written to a temporary file and swapped in with
+        os.replace(), so concurrent readers never see a partial file.
+        """
+        tmp_file = self.memory_file.with_suffix(".md.tmp")
+        tmp_file.write_text(content, encoding="utf-8")
+        os.replace(tmp_file, self.memory_file)
+        self._read_cache.pop(self.memory_file, None)
     
     def get_recent_memories(self, days: int = 7) -> str:
         """
@@ -63,18 +118,13 @@ class MemoryStore:
         Returns:
             Combined memory content.
         """
-        from datetime import timedelta
-        
         memories = []
-        today = datetime.now().date()
+        today = date.today()
         
         for i in range(days):
-            date = today - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            file_path = self.memory_dir / f"{date_str}.md"
-            
-            if file_path.exists():
-                content = file_path.read_text(encoding="utf-8")
+            date_str = (today - timedelta(days=i)).isoformat()
+            content = self._cached_read(self.memory_dir / f"{date_str}.md")
+            if content:
                 memories.append(content)
         
         return "\n\n---\n\n".join(memories)
@@ -9,6 +9,10 @@ from pathlib import Path
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# YAML frontmatter block at the top of a SKILL.md
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+_FRONTMATTER_BLOCK_RE = re.compile(r"^---\n.*?\n---\n", re.DOTALL)
+
 
 class SkillsLoader:
     """
@@ -161,7 +165,7 @@ class SkillsLoader:
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
         if content.startswith("---"):
-            match = re.match(r"^---\n.*?\n---\n", content, re.DOTALL)
+            match = _FRONTMATTER_BLOCK_RE.match(content)
             if match:
                 return content[match.end():].strip()
         return content
@@ -215,7 +219,7 @@ class SkillsLoader:
             return None
         
         if content.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+            match = _FRONTMATTER_RE.match(content)
             if match:
                 # Simple YAML parsing
                 metadata = {}
@@ -1,7 +1,6 @@
 """Subagent manager for background task execution."""
 
 import asyncio
-import json
 import uuid
 from pathlib import Path
 from typing import Any
@@ -15,6 +14,7 @@ from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.utils.helpers import json_dumps
 
 
 class SubagentManager:
@@ -115,6 +115,7 @@ class SubagentManager:
             ]
             
             # Run agent loop (limited iterations)
+            tool_defs = tools.get_definitions()
             max_iterations = 15
             iteration = 0
             final_result: str | None = None
@@ -124,7 +125,7 @@ class SubagentManager:
                 
                 response = await self.provider.chat(
                     messages=messages,
-                    tools=tools.get_definitions(),
+                    tools=tool_defs,
                     model=self.model,
                 )
                 
@@ -136,7 +137,7 @@ class SubagentManager:
                             "type": "function",
                             "function": {
                                 "name": tc.name,
-                                "arguments": json.dumps(tc.arguments),
+                                "arguments": json_dumps(tc.arguments),
                             },
                         }
                         for tc in response.tool_calls
@@ -147,10 +148,13 @@ class SubagentManager:
                         "tool_calls": tool_call_dicts,
                     })
                     
-                    # Execute tools
+                    # Read-only tools run concurrently; results are added in call order
                     for tool_call in response.tool_calls:
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_many(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls]
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
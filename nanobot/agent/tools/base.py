@@ -1,8 +1,20 @@
 """Base class for agent tools."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from contextvars import ContextVar
+from types import MappingProxyType
 from typing import Any
 
+# Context of the tool call being executed (e.g. origin channel/chat_id).
+# Set per call by ToolRegistry.execute; each asyncio task sees its own value,
+# so concurrently processed messages cannot see each other's context.
+tool_call_context: ContextVar[dict[str, Any] | None] = ContextVar(
+    "tool_call_context", default=None
+)
+
+_EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
 
 class Tool(ABC):
     """
@@ -39,6 +51,17 @@ class Tool(ABC):
         """JSON Schema for tool parameters."""
         pass
     
+    @property
+    def read_only(self) -> bool:
+        """Whether the tool has no side effects, so calls may run concurrently."""
+        return False
+    
+    @property
+    def context(self) -> Mapping[str, Any]:
+        """Context passed to ToolRegistry.execute for the current call (read-only)."""
+        context = tool_call_context.get()
+        return _EMPTY_CONTEXT if context is None else MappingProxyType(context)
+    
     @abstractmethod
     async def execute(self, **kwargs: Any) -> str:
         """
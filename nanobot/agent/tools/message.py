@@ -7,7 +7,12 @@ from nanobot.bus.events import OutboundMessage
 
 
 class MessageTool(Tool):
-    """Tool to send messages to users on chat channels."""
+    """
+    Tool to send messages to users on chat channels.
+    
+    The target defaults to the "channel"/"chat_id" of the call context,
+    falling back to the defaults given at construction.
+    """
     
     def __init__(
         self, 
@@ -19,11 +24,6 @@ class MessageTool(Tool):
         self._default_channel = default_channel
         self._default_chat_id = default_chat_id
     
-    def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the current message context."""
-        self._default_channel = channel
-        self._default_chat_id = chat_id
-    
     def set_send_callback(self, callback: Callable[[OutboundMessage], Awaitable[None]]) -> None:
         """Set the callback for sending messages."""
         self._send_callback = callback
@@ -64,8 +64,8 @@ class MessageTool(Tool):
         chat_id: str | None = None,
         **kwargs: Any
     ) -> str:
-        channel = channel or self._default_channel
-        chat_id = chat_id or self._default_chat_id
+        channel = channel or self.context.get("channel") or self._default_channel
+        chat_id = chat_id or self.context.get("chat_id") or self._default_chat_id
         
         if not channel or not chat_id:
             return "Error: No target channel/chat specified"
@@ -1,8 +1,11 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
+import sys
+from collections.abc import Awaitable
 from typing import Any
 
-from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.base import Tool, tool_call_context
 
 
 class ToolRegistry:
@@ -10,18 +13,23 @@ class ToolRegistry:
     Registry for agent tools.
     
     Allows dynamic registration and execution of tools.
+    Concurrent executions are capped by max_concurrency.
     """
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 8):
         self._tools: dict[str, Tool] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._definitions: list[dict[str, Any]] | None = None
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
-        self._tools[tool.name] = tool
+        self._tools[sys.intern(tool.name)] = tool
+        self._definitions = None
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
+        self._definitions = None
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -32,16 +40,30 @@ class ToolRegistry:
         return name in self._tools
     
     def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+        """
+        Get all tool definitions in OpenAI format.
+        
+        The list is built once and reused until the registered tools change,
+        so callers must not mutate it.
+        """
+        if self._definitions is None:
+            self._definitions = [tool.to_schema() for tool in self._tools.values()]
+        return self._definitions
     
-    async def execute(self, name: str, params: dict[str, Any]) -> str:
+    async def execute(
+        self,
+        name: str,
+        params: dict[str, Any],
+        context: dict[str, Any] | None = None,
+    ) -> str:
         """
         Execute a tool by name with given parameters.
         
         Args:
             name: Tool name.
             params: Tool parameters.
+            context: Per-call context (e.g. channel, chat_id), exposed to the
+                tool as `Tool.context` for this call only.
         
         Returns:
             Tool execution result as string.
@@ -57,10 +79,57 @@ class ToolRegistry:
             errors = tool.validate_params(params)
             if errors:
                 return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
-            return await tool.execute(**params)
+            async with self._semaphore:
+                if context is None:
+                    return await tool.execute(**params)
+                token = tool_call_context.set(context)
+                try:
+                    return await tool.execute(**params)
+                finally:
+                    tool_call_context.reset(token)
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
     
+    def is_read_only(self, name: str) -> bool:
+        """Check if a tool is registered and free of side effects."""
+        tool = self._tools.get(name)
+        return tool is not None and tool.read_only
+    
+    async def execute_many(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        context: dict[str, Any] | None = None,
+        started: list[Awaitable[str] | None] | None = None,
+    ) -> list[str]:
+        """
+        Execute several tool calls, keeping the effects of their order.
+        
+        Consecutive read-only calls run concurrently; any other call waits for
+        everything before it and finishes before the next call starts.
+        
+        Args:
+            calls: (name, params) pairs in the order they were requested.
+            context: Per-call context, as for execute().
+            started: Optional already-started executions, aligned with calls.
+        
+        Returns:
+            Tool results, in the same order as calls.
+        """
+        results: list[str] = []
+        pending: list[Awaitable[str]] = []
+        for i, (name, params) in enumerate(calls):
+            run = (started[i] if started else None) or self.execute(name, params, context)
+            if self.is_read_only(name):
+                pending.append(run)
+                continue
+            if pending:
+                results.extend(await asyncio.gather(*pending))
+                pending.clear()
+            results.append(await run)
+        if pending:
+            results.extend(await asyncio.gather(*pending))
+        return results
+    
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -8,6 +8,10 @@ from typing import Any
 
 from nanobot.agent.tools.base import Tool
 
+# Absolute paths mentioned in a command (checked when restricted to the workspace)
+_WIN_PATH_RE = re.compile(r"[A-Za-z]:\\[^\\\"']+")
+_POSIX_PATH_RE = re.compile(r"/[^\s\"']+")
+
 
 class ExecTool(Tool):
     """Tool to execute shell commands."""
@@ -34,6 +38,9 @@ class ExecTool(Tool):
         ]
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
+        # Compiled once; the guard runs before every command
+        self._deny_res = [re.compile(p) for p in self.deny_patterns]
+        self._allow_res = [re.compile(p) for p in self.allow_patterns]
     
     @property
     def name(self) -> str:
@@ -113,12 +120,12 @@ class ExecTool(Tool):
         cmd = command.strip()
         lower = cmd.lower()
 
-        for pattern in self.deny_patterns:
-            if re.search(pattern, lower):
+        for pattern in self._deny_res:
+            if pattern.search(lower):
                 return "Error: Command blocked by safety guard (dangerous pattern detected)"
 
-        if self.allow_patterns:
-            if not any(re.search(p, lower) for p in self.allow_patterns):
+        if self._allow_res:
+            if not any(p.search(lower) for p in self._allow_res):
                 return "Error: Command blocked by safety guard (not in allowlist)"
 
         if self.restrict_to_workspace:
@@ -127,8 +134,8 @@ class ExecTool(Tool):
 
             cwd_path = Path(cwd).resolve()
 
-            win_paths = re.findall(r"[A-Za-z]:\\[^\\\"']+", cmd)
-            posix_paths = re.findall(r"/[^\s\"']+", cmd)
+            win_paths = _WIN_PATH_RE.findall(cmd)
+            posix_paths = _POSIX_PATH_RE.findall(cmd)
 
             for raw in win_paths + posix_paths:
                 try:
@@ -13,18 +13,12 @@ class SpawnTool(Tool):
     Tool to spawn a subagent for background task execution.
     
     The subagent runs asynchronously and announces its result back
-    to the main agent when complete.
+    to the main agent when complete, to the "channel"/"chat_id" of the
+    call context.
     """
     
     def __init__(self, manager: "SubagentManager"):
         self._manager = manager
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
-    
-    def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
     
     @property
     def name(self) -> str:
@@ -60,6 +54,6 @@ class SpawnTool(Tool):
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
+            origin_channel=self.context.get("channel", "cli"),
+            origin_chat_id=self.context.get("chat_id", "direct"),
         )
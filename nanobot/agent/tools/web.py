@@ -17,19 +17,31 @@ from nanobot.agent.tools.base import Tool
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
 
+# Precompiled patterns; _strip_tags runs once per link/heading/list item
+_SCRIPT_RE = re.compile(r'<script[\s\S]*?</script>', re.I)
+_STYLE_RE = re.compile(r'<style[\s\S]*?</style>', re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACES_RE = re.compile(r'[ \t]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_LINK_RE = re.compile(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>', re.I)
+_HEADING_RE = re.compile(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>', re.I)
+_LIST_ITEM_RE = re.compile(r'<li[^>]*>([\s\S]*?)</li>', re.I)
+_BLOCK_END_RE = re.compile(r'</(p|div|section|article)>', re.I)
+_LINE_BREAK_RE = re.compile(r'<(br|hr)\s*/?>', re.I)
+
 
 def _strip_tags(text: str) -> str:
     """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _SCRIPT_RE.sub('', text)
+    text = _STYLE_RE.sub('', text)
+    text = _TAG_RE.sub('', text)
     return html.unescape(text).strip()
 
 
 def _normalize(text: str) -> str:
     """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+    text = _SPACES_RE.sub(' ', text)
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -49,6 +61,7 @@ class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
     name = "web_search"
+    read_only = True
     description = "Search the web. Returns titles, URLs, and snippets."
     parameters = {
         "type": "object",
@@ -96,6 +109,7 @@ class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
     
     name = "web_fetch"
+    read_only = True
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
     parameters = {
         "type": "object",
@@ -155,13 +169,11 @@ class WebFetchTool(Tool):
     def _to_markdown(self, html: str) -> str:
         """Convert HTML to markdown."""
         # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+        text = _LINK_RE.sub(lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html)
+        text = _HEADING_RE.sub(lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text)
+        text = _LIST_ITEM_RE.sub(lambda m: f'\n- {_strip_tags(m[1])}', text)
+        text = _BLOCK_END_RE.sub('\n\n', text)
+        text = _LINE_BREAK_RE.sub('\n', text)
         return _normalize(_strip_tags(text))
 
 
@@ -169,6 +181,7 @@ class OllamaWebSearchTool(Tool):
     """Search the web using Ollama's web search API."""
     
     name = "ollama_web_search"
+    read_only = True
     description = "Search the web using Ollama. Returns titles, URLs, and content snippets."
     parameters = {
         "type": "object",
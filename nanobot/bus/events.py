@@ -1,5 +1,6 @@
 """Event types for the message bus."""
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -20,7 +21,8 @@ class InboundMessage:
     @property
     def session_key(self) -> str:
         """Unique key for session identification."""
-        return f"{self.channel}:{self.chat_id}"
+        # Interned: used as a dict key by sessions, locks and usage stats
+        return sys.intern(f"{self.channel}:{self.chat_id}")
 
 
 @dataclass
@@ -224,6 +224,10 @@ def gateway(
         ollama_web_search_base_url=config.tools.web.ollama_search.base_url if config.tools.web.ollama_search.enabled else None,
         exec_config=config.tools.exec,
         usage_alert_config=config.usage_alert,
+        prompt_cache_size=config.agents.defaults.prompt_cache_size,
+        max_concurrent_messages=config.agents.defaults.max_concurrent_messages,
+        stream_tool_calls=config.agents.defaults.stream_tool_calls,
+        max_turn_seconds=config.agents.defaults.max_turn_seconds,
     )
     
     # Create cron service
@@ -347,6 +351,10 @@ def agent(
         ollama_web_search_base_url=config.tools.web.ollama_search.base_url if config.tools.web.ollama_search.enabled else None,
         exec_config=config.tools.exec,
         usage_alert_config=config.usage_alert,
+        prompt_cache_size=config.agents.defaults.prompt_cache_size,
+        max_concurrent_messages=config.agents.defaults.max_concurrent_messages,
+        stream_tool_calls=config.agents.defaults.stream_tool_calls,
+        max_turn_seconds=config.agents.defaults.max_turn_seconds,
     )
     
     if message:
@@ -354,6 +362,7 @@ def agent(
         async def run_once():
             response = await agent_loop.process_direct(message, session_id)
             console.print(f"\n{__logo__} {response}")
+            await agent_loop.drain()
         
         asyncio.run(run_once())
     else:
@@ -372,6 +381,7 @@ def agent(
                 except KeyboardInterrupt:
                     console.print("\nGoodbye!")
                     break
+            await agent_loop.drain()
         
         asyncio.run(run_interactive())
 
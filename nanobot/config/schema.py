@@ -32,6 +32,10 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    prompt_cache_size: int = 128  # Cached LLM responses (0 disables)
+    max_concurrent_messages: int = 4  # Messages processed at once across sessions
+    max_turn_seconds: float = 300  # Time limit for one message, including tool calls
+    stream_tool_calls: bool = False  # Start read-only tools while the LLM is still streaming
 
 
 class AgentsConfig(BaseModel):
@@ -1,6 +1,18 @@
 """LLM provider abstraction module."""
 
+from typing import TYPE_CHECKING
+
 from nanobot.providers.base import LLMProvider, LLMResponse
-from nanobot.providers.litellm_provider import LiteLLMProvider
+
+if TYPE_CHECKING:
+    from nanobot.providers.litellm_provider import LiteLLMProvider
 
 __all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider"]
+
+
+def __getattr__(name: str):
+    # litellm takes seconds to import; only load it when actually requested
+    if name == "LiteLLMProvider":
+        from nanobot.providers.litellm_provider import LiteLLMProvider
+        return LiteLLMProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator
 
 
 @dataclass
@@ -63,6 +63,26 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[ToolCallRequest | LLMResponse]:
+        """
+        Stream a chat completion.
+        
+        Yields each ToolCallRequest as soon as its arguments are complete, so
+        callers can start executing it early, and the full LLMResponse last.
+        Providers without streaming support yield only the final response.
+        
+        Args:
+            Same as chat().
+        """
+        yield await self.chat(messages, tools, model, max_tokens, temperature)
+    
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
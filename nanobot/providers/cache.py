@@ -0,0 +1,61 @@
+"""Content-addressed cache for LLM chat responses."""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any
+
+from nanobot.providers.base import LLMResponse
+from nanobot.utils.helpers import canonical_json
+
+
+class PromptCache:
+    """
+    In-memory LRU cache of LLM responses.
+
+    Responses are keyed by a hash of the request (messages, tools, model), so
+    an identical request returns the stored response instead of paying for
+    another provider round-trip.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, LLMResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str,
+    ) -> str:
+        """Build the cache key for a chat request."""
+        payload = canonical_json({"messages": messages, "tools": tools, "model": model})
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> LLMResponse | None:
+        """Look up a cached response, marking it as recently used."""
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        # Errors are transient; never replay them
+        if response.finish_reason == "error":
+            return
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
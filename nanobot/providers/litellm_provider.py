@@ -1,12 +1,17 @@
 """LiteLLM provider implementation for multi-provider support."""
 
+import json
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 import litellm
 from litellm import acompletion
 
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.utils.helpers import json_loads
+
+# Separator between system prompt sections (see ContextBuilder.build_system_prompt)
+SECTION_SEPARATOR = "\n\n---\n\n"
 
 
 class LiteLLMProvider(LLMProvider):
@@ -81,6 +86,82 @@ class LiteLLMProvider(LLMProvider):
         Returns:
             LLMResponse with content and/or tool calls.
         """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        
+        try:
+            response = await acompletion(**kwargs)
+            return self._parse_response(response)
+        except Exception as e:
+            # Return error as content for graceful handling
+            return LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            )
+    
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[ToolCallRequest | LLMResponse]:
+        """
+        Stream a chat completion via LiteLLM.
+        
+        A tool call is yielded as soon as the stream moves on to the next one
+        (its arguments are then complete); the rest are yielded when the
+        stream ends, followed by the assembled LLMResponse.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        if self._supports_stream_usage(kwargs["model"]):
+            kwargs["stream_options"] = {"include_usage": True}
+        
+        try:
+            stream = await acompletion(**kwargs)
+            chunks = []
+            current: dict[str, Any] | None = None
+            
+            async for chunk in stream:
+                chunks.append(chunk)
+                if not chunk.choices:
+                    continue
+                for delta in getattr(chunk.choices[0].delta, "tool_calls", None) or []:
+                    # A new id or index starts the next call, so the current one is complete
+                    starts_new = current is None or delta.index != current["index"] or (
+                        delta.id and delta.id != current["id"]
+                    )
+                    if starts_new:
+                        if current is not None:
+                            yield self._build_tool_call(current)
+                        current = {"index": delta.index, "id": delta.id, "name": "", "arguments": ""}
+                    function = delta.function
+                    if function is not None:
+                        current["name"] += function.name or ""
+                        current["arguments"] += function.arguments or ""
+            
+            if current is not None:
+                yield self._build_tool_call(current)
+            
+            response = litellm.stream_chunk_builder(chunks, messages=messages)
+            yield self._parse_response(response)
+        except Exception as e:
+            # Return error as content for graceful handling
+            yield LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            )
+    
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build acompletion() arguments, resolving the provider-specific model name."""
         model = model or self.default_model
         
         # For OpenRouter, prefix model name if not already prefixed
@@ -105,6 +186,10 @@ class LiteLLMProvider(LLMProvider):
         if "gemini" in model.lower() and not model.startswith("gemini/"):
             model = f"gemini/{model}"
         
+        # Anthropic only reuses a cached prompt prefix up to an explicit breakpoint
+        if self._supports_cache_control(model):
+            messages = self._add_cache_breakpoint(messages)
+        
         kwargs: dict[str, Any] = {
             "model": model,
             "messages": messages,
@@ -120,15 +205,55 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
+        return kwargs
+    
+    @staticmethod
+    def _supports_cache_control(model: str) -> bool:
+        """Check if the model takes Anthropic-style cache_control breakpoints."""
+        name = model.lower()
+        return "anthropic" in name or "claude" in name
+    
+    @staticmethod
+    def _add_cache_breakpoint(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Mark the stable part of the system prompt as a cache breakpoint.
+        
+        The last section of the system prompt is the current time, which
+        changes every minute, so the breakpoint goes just before it. Tools and
+        the rest of the system prompt are then cached across turns. Returns a
+        new list; the caller's messages are not modified.
+        """
+        if not messages or messages[0].get("role") != "system":
+            return messages
+        content = messages[0].get("content")
+        if not isinstance(content, str) or not content:
+            return messages
+        
+        stable, sep, tail = content.rpartition(SECTION_SEPARATOR)
+        if not stable:
+            stable, sep, tail = content, "", ""
+        blocks = [{"type": "text", "text": stable, "cache_control": {"type": "ephemeral"}}]
+        if tail:
+            blocks.append({"type": "text", "text": sep + tail})
+        return [{**messages[0], "content": blocks}, *messages[1:]]
+    
+    @staticmethod
+    def _supports_stream_usage(model: str) -> bool:
+        """Check if the backend accepts stream_options; some reject unknown params."""
         try:
-            response = await acompletion(**kwargs)
-            return self._parse_response(response)
-        except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+            supported = litellm.get_supported_openai_params(model=model)
+        except Exception:
+            return False
+        return "stream_options" in (supported or [])
+    
+    @staticmethod
+    def _build_tool_call(call: dict[str, Any]) -> ToolCallRequest:
+        """Build a ToolCallRequest from accumulated stream deltas."""
+        try:
+            args = json_loads(call["arguments"]) if call["arguments"] else {}
+        except json.JSONDecodeError:
+            args = {"raw": call["arguments"]}
+        return ToolCallRequest(id=call["id"] or "", name=call["name"], arguments=args)
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -141,9 +266,8 @@ class LiteLLMProvider(LLMProvider):
                 # Parse arguments from JSON string if needed
                 args = tc.function.arguments
                 if isinstance(args, str):
-                    import json
                     try:
-                        args = json.loads(args)
+                        args = json_loads(args)
                     except json.JSONDecodeError:
                         args = {"raw": args}
                 
@@ -160,7 +284,12 @@ class LiteLLMProvider(LLMProvider):
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens,
             }
-        
+            # Provider-side prompt caching (OpenAI/Anthropic) reports reused prefix tokens
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", None) or 0
+            if cached_tokens:
+                usage["cached_tokens"] = cached_tokens
+
         return LLMResponse(
             content=message.content,
             tool_calls=tool_calls,
@@ -8,6 +8,7 @@ from typing import Any
 from loguru import logger
 
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.utils.helpers import json_loads
 
 
 class OllamaProvider(LLMProvider):
@@ -156,7 +157,7 @@ class OllamaProvider(LLMProvider):
                         # Convert JSON string to dict if necessary
                         if isinstance(arguments, str):
                             try:
-                                tc_copy["function"]["arguments"] = json.loads(arguments)
+                                tc_copy["function"]["arguments"] = json_loads(arguments)
                             except json.JSONDecodeError:
                                 logger.warning(f"Failed to parse tool_call arguments: {arguments}")
                                 tc_copy["function"]["arguments"] = {}
@@ -184,7 +185,7 @@ class OllamaProvider(LLMProvider):
                 # Ollama may return arguments as JSON string, need to parse it
                 if isinstance(arguments, str):
                     try:
-                        arguments = json.loads(arguments)
+                        arguments = json_loads(arguments)
                     except json.JSONDecodeError:
                         logger.warning(f"Failed to parse arguments as JSON: {arguments}")
                         arguments = {}
@@ -1,6 +1,6 @@
 """Session management for conversation history."""
 
-import json
+import os
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -8,7 +8,7 @@ from typing import Any
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.helpers import ensure_dir, json_dumps, json_loads, safe_filename
 
 
 @dataclass
@@ -24,6 +24,11 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # LLM-format view of messages, kept in sync so get_history() does not rebuild it
+    _history: list[dict[str, Any]] = field(default_factory=list, init=False, repr=False)
+    
+    def __post_init__(self) -> None:
+        self._history = [{"role": m["role"], "content": m["content"]} for m in self.messages]
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -34,6 +39,7 @@ class Session:
             **kwargs
         }
         self.messages.append(msg)
+        self._history.append({"role": role, "content": content})
         self.updated_at = datetime.now()
     
     def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
@@ -44,17 +50,15 @@ class Session:
             max_messages: Maximum messages to return.
         
         Returns:
-            List of messages in LLM format.
+            List of messages in LLM format (just role and content). The
+            message dicts are shared with the session and must not be mutated.
         """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-        
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        return self._history[-max_messages:]
     
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self._history = []
         self.updated_at = datetime.now()
 
 
@@ -109,13 +113,13 @@ class SessionManager:
             metadata = {}
             created_at = None
             
-            with open(path) as f:
+            with open(path, encoding="utf-8") as f:
                 for line in f:
                     line = line.strip()
                     if not line:
                         continue
                     
-                    data = json.loads(line)
+                    data = json_loads(line)
                     
                     if data.get("_type") == "metadata":
                         metadata = data.get("metadata", {})
@@ -137,19 +141,22 @@ class SessionManager:
         """Save a session to disk."""
         path = self._get_session_path(session.key)
         
-        with open(path, "w") as f:
-            # Write metadata first
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            
-            # Write messages
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
+        # Metadata first, then one line per message
+        metadata_line = {
+            "_type": "metadata",
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata
+        }
+        lines = [json_dumps(metadata_line)]
+        lines.extend(json_dumps(msg) for msg in session.messages)
+        lines.append("")
+        
+        # Write to a temp file and swap it in so a crash never leaves a torn session
+        tmp_path = path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        os.replace(tmp_path, path)
         
         self._cache[session.key] = session
     
@@ -185,10 +192,10 @@ class SessionManager:
         for path in self.sessions_dir.glob("*.jsonl"):
             try:
                 # Read just the metadata line
-                with open(path) as f:
+                with open(path, encoding="utf-8") as f:
                     first_line = f.readline().strip()
                     if first_line:
-                        data = json.loads(first_line)
+                        data = json_loads(first_line)
                         if data.get("_type") == "metadata":
                             sessions.append({
                                 "key": path.stem.replace("_", ":"),
@@ -1,9 +1,10 @@
 """Token usage tracker for monitoring LLM API consumption."""
 
 import json
+import os
 from pathlib import Path
-from datetime import datetime, date
-from dataclasses import dataclass, field, asdict
+from datetime import datetime, date, timedelta
+from dataclasses import dataclass, field
 from typing import Any
 
 from loguru import logger
@@ -11,7 +12,7 @@ from loguru import logger
 from nanobot.utils.helpers import ensure_dir
 
 
-@dataclass
+@dataclass(slots=True)
 class UsageRecord:
     """A single usage record for an LLM call."""
     
@@ -21,21 +22,39 @@ class UsageRecord:
     prompt_tokens: int
     completion_tokens: int
     total_tokens: int
+    cached_tokens: int = 0
+    saved_tokens: int = 0
     metadata: dict[str, Any] = field(default_factory=dict)
     
     @property
     def date(self) -> str:
         """Get the date (YYYY-MM-DD) of this record."""
         return self.timestamp.split("T")[0]
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary (shallow, unlike dataclasses.asdict)."""
+        return {
+            "timestamp": self.timestamp,
+            "session_key": self.session_key,
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "saved_tokens": self.saved_tokens,
+            "metadata": self.metadata,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class UsageStats:
     """Aggregated usage statistics."""
     
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
+    cached_tokens: int = 0
+    saved_tokens: int = 0
     call_count: int = 0
     
     def add(self, record: UsageRecord) -> None:
@@ -43,6 +62,8 @@ class UsageStats:
         self.prompt_tokens += record.prompt_tokens
         self.completion_tokens += record.completion_tokens
         self.total_tokens += record.total_tokens
+        self.cached_tokens += record.cached_tokens
+        self.saved_tokens += record.saved_tokens
         self.call_count += 1
     
     def to_dict(self) -> dict[str, int]:
@@ -51,6 +72,8 @@ class UsageStats:
             "prompt_tokens": self.prompt_tokens,
             "completion_tokens": self.completion_tokens,
             "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "saved_tokens": self.saved_tokens,
             "call_count": self.call_count,
         }
 
@@ -89,10 +112,14 @@ class UsageTracker:
         self._sessions: dict[str, UsageStats] = {}
         self._daily: dict[str, UsageStats] = {}
         self._records: list[UsageRecord] = []
+        self._unsaved = 0
         
         # Load existing data
         self._load()
     
+    # Number of unsaved records that triggers a write to disk
+    SAVE_EVERY = 10
+    
     def track(
         self,
         session_key: str,
@@ -100,6 +127,8 @@ class UsageTracker:
         prompt_tokens: int,
         completion_tokens: int,
         total_tokens: int | None = None,
+        cached_tokens: int = 0,
+        saved_tokens: int = 0,
         **metadata: Any
     ) -> None:
         """
@@ -111,8 +140,45 @@ class UsageTracker:
             prompt_tokens: Number of prompt tokens
             completion_tokens: Number of completion tokens
             total_tokens: Total tokens (auto-calculated if None)
+            cached_tokens: Prompt tokens the provider reused from its prompt cache
+            saved_tokens: Tokens not spent because the local prompt cache answered
             **metadata: Additional metadata to store
         """
+        self._apply(
+            session_key, model, prompt_tokens, completion_tokens,
+            total_tokens, cached_tokens, saved_tokens, **metadata
+        )
+        self._maybe_save()
+    
+    def track_batch(self, entries: list[dict[str, Any]]) -> None:
+        """
+        Track several LLM API calls with at most one write to disk.
+        
+        Args:
+            entries: Keyword arguments for track(), one dict per call.
+        """
+        for entry in entries:
+            self._apply(**entry)
+        if entries:
+            self._maybe_save()
+    
+    def flush(self) -> None:
+        """Write any unsaved usage data to disk."""
+        if self._unsaved:
+            self._save()
+    
+    def _apply(
+        self,
+        session_key: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        total_tokens: int | None = None,
+        cached_tokens: int = 0,
+        saved_tokens: int = 0,
+        **metadata: Any
+    ) -> None:
+        """Record a call in memory without persisting it."""
         if total_tokens is None:
             total_tokens = prompt_tokens + completion_tokens
         
@@ -124,6 +190,8 @@ class UsageTracker:
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
             total_tokens=total_tokens,
+            cached_tokens=cached_tokens,
+            saved_tokens=saved_tokens,
             metadata=metadata
         )
         
@@ -141,17 +209,18 @@ class UsageTracker:
         
         # Store record
         self._records.append(record)
-        
-        # Persist to disk periodically to reduce I/O overhead
-        # Save every 10 records or when total is divisible by 10
-        if len(self._records) % 10 == 0:
-            self._save()
+        self._unsaved += 1
         
         logger.debug(
             f"Tracked usage: {session_key} | {model} | "
             f"{prompt_tokens}+{completion_tokens}={total_tokens} tokens"
         )
     
+    def _maybe_save(self) -> None:
+        """Persist to disk periodically to reduce I/O overhead."""
+        if self._unsaved >= self.SAVE_EVERY:
+            self._save()
+    
     def get_total(self) -> dict[str, int]:
         """Get total usage statistics."""
         return self._total.to_dict()
@@ -174,10 +243,18 @@ class UsageTracker:
         stats = self._daily.get(date_str)
         return stats.to_dict() if stats else None
     
+    def get_session_total(self, session_key: str) -> int:
+        """Get total tokens used by a session (0 if unknown)."""
+        stats = self._sessions.get(session_key)
+        return stats.total_tokens if stats else 0
+    
+    def get_daily_total(self, date_str: str | None = None) -> int:
+        """Get total tokens used on a date (defaults to today)."""
+        stats = self._daily.get(date_str or date.today().isoformat())
+        return stats.total_tokens if stats else 0
+    
     def get_week(self) -> dict[str, int]:
         """Get usage statistics for the current week."""
-        from datetime import timedelta
-        
         today = date.today()
         week_start = today - timedelta(days=today.weekday())
         
@@ -190,6 +267,8 @@ class UsageTracker:
                 week_stats.prompt_tokens += daily.prompt_tokens
                 week_stats.completion_tokens += daily.completion_tokens
                 week_stats.total_tokens += daily.total_tokens
+                week_stats.cached_tokens += daily.cached_tokens
+                week_stats.saved_tokens += daily.saved_tokens
                 week_stats.call_count += daily.call_count
         
         return week_stats.to_dict()
@@ -209,7 +288,7 @@ class UsageTracker:
             "total": self._total.to_dict(),
             "sessions": {k: v.to_dict() for k, v in self._sessions.items()},
             "daily": {k: v.to_dict() for k, v in self._daily.items()},
-            "records": [asdict(r) for r in self._records],
+            "records": [r.to_dict() for r in self._records],
         }
     
     def clear(self) -> None:
@@ -263,7 +342,11 @@ class UsageTracker:
         """Save usage data to disk."""
         try:
             data = self.export()
-            with open(self.stats_file, "w") as f:
-                json.dump(data, f, indent=2)
+            # Write to a temp file and swap it in so a crash never leaves a torn file
+            tmp_file = self.stats_file.with_suffix(".json.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_file, self.stats_file)
+            self._unsaved = 0
         except Exception as e:
             logger.error(f"Failed to save usage data: {e}")
@@ -1,7 +1,14 @@
 """Utility functions for nanobot."""
 
+import json
 from pathlib import Path
 from datetime import datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
 
 
 def ensure_dir(path: Path) -> Path:
@@ -59,6 +66,62 @@ def timestamp() -> str:
     return datetime.now().isoformat()
 
 
+def json_dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            pass  # e.g. non-str keys or >64-bit ints; stdlib handles these
+    return json.dumps(obj)
+
+
+def canonical_json(obj: Any) -> bytes:
+    """
+    Serialize to deterministic JSON bytes (sorted keys) for hashing.
+    
+    Values that are not JSON-serializable are converted with str().
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            pass  # e.g. >64-bit ints; stdlib handles these
+    return json.dumps(_str_keys(obj), sort_keys=True, default=str).encode("utf-8")
+
+
+def _str_keys(obj: Any) -> Any:
+    """Recursively stringify dict keys as orjson's OPT_NON_STR_KEYS does, so mixed keys sort."""
+    if isinstance(obj, dict):
+        return {_str_key(k): _str_keys(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_str_keys(v) for v in obj]
+    return obj
+
+
+def _str_key(key: Any) -> str:
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)  # null, true, 1, 1.5
+    return str(key)
+
+
+def json_loads(data: str | bytes) -> Any:
+    """
+    Parse JSON, using orjson when installed.
+    
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON (orjson's error
+            type subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def truncate_string(s: str, max_len: int = 100, suffix: str = "...") -> str:
     """Truncate a string to max length, adding suffix if truncated."""
     if len(s) <= max_len:
@@ -0,0 +1,410 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.base import Tool
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class ScriptedProvider(LLMProvider):
+    """Provider that replays a fixed list of responses."""
+
+    def __init__(self, responses: list[LLMResponse]):
+        super().__init__()
+        self.responses = list(responses)
+        self.calls: list[list[dict[str, Any]]] = []
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        self.calls.append(list(messages))
+        if self.responses:
+            return self.responses.pop(0)
+        return LLMResponse(content="done")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.fixture
+def workspace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # Sessions and usage stats live under ~/.nanobot
+    monkeypatch.setenv("HOME", str(tmp_path))
+    ws = tmp_path / "workspace"
+    ws.mkdir()
+    return ws
+
+
+def make_loop(workspace: Path, responses: list[LLMResponse], **kwargs: Any) -> AgentLoop:
+    return AgentLoop(
+        bus=MessageBus(),
+        provider=ScriptedProvider(responses),
+        workspace=workspace,
+        **kwargs,
+    )
+
+
+async def test_run_processes_messages_and_stops_promptly(workspace: Path) -> None:
+    loop = make_loop(workspace, [LLMResponse(content="hello back")])
+    runner = asyncio.create_task(loop.run())
+
+    await loop.bus.publish_inbound(
+        InboundMessage(channel="test", sender_id="u", chat_id="c", content="hello")
+    )
+    out = await asyncio.wait_for(loop.bus.consume_outbound(), timeout=5)
+    assert out.content == "hello back"
+
+    loop.stop()
+    await asyncio.wait_for(runner, timeout=1)
+
+
+class GatedProvider(ScriptedProvider):
+    """Provider that blocks requests containing "slow" until released."""
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.release = asyncio.Event()
+
+    async def chat(self, messages: list[dict[str, Any]], *args: Any, **kwargs: Any) -> LLMResponse:
+        text = messages[-1]["content"]
+        if "slow" in text:
+            await self.release.wait()
+        return LLMResponse(content=f"re: {text}")
+
+
+async def test_slow_session_does_not_block_other_sessions(workspace: Path) -> None:
+    provider = GatedProvider()
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=workspace)
+    runner = asyncio.create_task(loop.run())
+
+    await loop.bus.publish_inbound(
+        InboundMessage(channel="test", sender_id="u", chat_id="a", content="slow")
+    )
+    await loop.bus.publish_inbound(
+        InboundMessage(channel="test", sender_id="u", chat_id="b", content="fast")
+    )
+    out = await asyncio.wait_for(loop.bus.consume_outbound(), timeout=5)
+    assert out.chat_id == "b"
+
+    provider.release.set()
+    out = await asyncio.wait_for(loop.bus.consume_outbound(), timeout=5)
+    assert out.chat_id == "a"
+
+    loop.stop()
+    await asyncio.wait_for(runner, timeout=1)
+
+
+class MessagingProvider(ScriptedProvider):
+    """Answers every chat with a message tool call once both chats are in flight."""
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.started = 0
+        self.both_started = asyncio.Event()
+
+    async def chat(self, messages: list[dict[str, Any]], *args: Any, **kwargs: Any) -> LLMResponse:
+        if messages[-1]["role"] == "tool":
+            return LLMResponse(content="done")
+        self.started += 1
+        if self.started == 2:
+            self.both_started.set()
+        await self.both_started.wait()
+        text = messages[-1]["content"]
+        call = ToolCallRequest(id=text, name="message", arguments={"content": text})
+        return LLMResponse(content=None, tool_calls=[call])
+
+
+async def test_message_tool_replies_to_its_own_chat(workspace: Path) -> None:
+    loop = AgentLoop(bus=MessageBus(), provider=MessagingProvider(), workspace=workspace)
+    runner = asyncio.create_task(loop.run())
+
+    for chat_id in ("a", "b"):
+        await loop.bus.publish_inbound(
+            InboundMessage(channel="test", sender_id="u", chat_id=chat_id, content=f"from-{chat_id}")
+        )
+    outs = [await asyncio.wait_for(loop.bus.consume_outbound(), timeout=5) for _ in range(4)]
+    sent = {out.content: out.chat_id for out in outs if out.content != "done"}
+    assert sent == {"from-a": "a", "from-b": "b"}
+
+    loop.stop()
+    await asyncio.wait_for(runner, timeout=1)
+
+
+class SleepTool(Tool):
+    """Tool that sleeps for the requested time and echoes it."""
+
+    def __init__(
+        self, name: str = "sleep", read_only: bool = True, log: list[str] | None = None
+    ) -> None:
+        self._name = name
+        self._read_only = read_only
+        self.log = [] if log is None else log
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    @property
+    def description(self) -> str:
+        return "sleep"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"secs": {"type": "number"}}}
+
+    async def execute(self, secs: float = 0, **kwargs: Any) -> str:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.log.append(f"{self.name}+")
+        await asyncio.sleep(secs)
+        self.log.append(f"{self.name}-")
+        self.active -= 1
+        return f"slept {secs}"
+
+
+async def test_tool_calls_run_concurrently_and_keep_order(workspace: Path) -> None:
+    calls = [
+        ToolCallRequest(id="1", name="sleep", arguments={"secs": 0.05}),
+        ToolCallRequest(id="2", name="sleep", arguments={"secs": 0.01}),
+    ]
+    loop = make_loop(workspace, [LLMResponse(content=None, tool_calls=calls)])
+    tool = SleepTool()
+    loop.tools.register(tool)
+
+    assert await loop.process_direct("go") == "done"
+    assert tool.max_active == 2
+
+    tool_msgs = [m for m in loop.provider.calls[-1] if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_msgs] == ["1", "2"]
+    assert tool_msgs[0]["content"] == "slept 0.05"
+
+
+async def test_tool_calls_with_side_effects_run_in_order(workspace: Path) -> None:
+    calls = [
+        ToolCallRequest(id="1", name="sleep", arguments={"secs": 0.02}),
+        ToolCallRequest(id="2", name="write", arguments={"secs": 0.01}),
+        ToolCallRequest(id="3", name="write", arguments={"secs": 0}),
+        ToolCallRequest(id="4", name="sleep", arguments={"secs": 0}),
+    ]
+    loop = make_loop(workspace, [LLMResponse(content=None, tool_calls=calls)])
+    log: list[str] = []
+    loop.tools.register(SleepTool(log=log))
+    loop.tools.register(SleepTool("write", read_only=False, log=log))
+
+    assert await loop.process_direct("go") == "done"
+    assert log == ["sleep+", "sleep-", "write+", "write-", "write+", "write-", "sleep+", "sleep-"]
+
+    tool_msgs = [m for m in loop.provider.calls[-1] if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_msgs] == ["1", "2", "3", "4"]
+
+
+async def test_usage_alerts_use_running_totals(workspace: Path) -> None:
+    from nanobot.config.schema import UsageAlertConfig
+
+    loop = make_loop(
+        workspace, [],
+        usage_alert_config=UsageAlertConfig(enabled=True, session_limit=100, daily_limit=0),
+    )
+    assert loop._check_usage_alerts("test:s") is None
+
+    loop.usage_tracker.track("test:s", "m", prompt_tokens=100, completion_tokens=1)
+    warning = loop._check_usage_alerts("test:s")
+    assert warning and "Session token limit exceeded: 101 / 100" in warning
+
+
+class StreamingProvider(ScriptedProvider):
+    """Streams one tool call and only finishes once that tool has started."""
+
+    def __init__(self, tool: "SleepTool"):
+        super().__init__([LLMResponse(content="done")])
+        self.tool = tool
+        self.call = ToolCallRequest(id="s1", name="sleep", arguments={"secs": 0})
+
+    async def chat_stream(self, messages: list[dict[str, Any]], *args: Any, **kwargs: Any):
+        if any(m["role"] == "tool" for m in messages):
+            yield await self.chat(messages)
+            return
+        yield self.call
+        while self.tool.max_active == 0:
+            await asyncio.sleep(0)
+        yield LLMResponse(content=None, tool_calls=[self.call])
+
+
+async def test_streamed_tool_calls_start_before_response_completes(workspace: Path) -> None:
+    tool = SleepTool()
+    loop = AgentLoop(
+        bus=MessageBus(), provider=StreamingProvider(tool), workspace=workspace,
+        stream_tool_calls=True,
+    )
+    loop.tools.register(tool)
+
+    assert await asyncio.wait_for(loop.process_direct("go"), timeout=5) == "done"
+    tool_msgs = [m for m in loop.provider.calls[-1] if m["role"] == "tool"]
+    assert [m["content"] for m in tool_msgs] == ["slept 0"]
+
+
+class WriteFirstStreamingProvider(ScriptedProvider):
+    """Streams a side-effecting call then a read-only one, noting what ran early."""
+
+    def __init__(self, log: list[str]):
+        super().__init__([LLMResponse(content="done")])
+        self.log = log
+        self.tool_calls = [
+            ToolCallRequest(id="w", name="write", arguments={"secs": 0}),
+            ToolCallRequest(id="r", name="sleep", arguments={"secs": 0}),
+        ]
+        self.ran_early: list[str] = []
+
+    async def chat_stream(self, messages: list[dict[str, Any]], *args: Any, **kwargs: Any):
+        if any(m["role"] == "tool" for m in messages):
+            yield await self.chat(messages)
+            return
+        for call in self.tool_calls:
+            yield call
+        await asyncio.sleep(0.01)
+        self.ran_early = list(self.log)
+        yield LLMResponse(content=None, tool_calls=self.tool_calls)
+
+
+async def test_streaming_only_starts_read_only_tools_early(workspace: Path) -> None:
+    log: list[str] = []
+    provider = WriteFirstStreamingProvider(log)
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=workspace, stream_tool_calls=True
+    )
+    loop.tools.register(SleepTool(log=log))
+    loop.tools.register(SleepTool("write", read_only=False, log=log))
+
+    assert await asyncio.wait_for(loop.process_direct("go"), timeout=5) == "done"
+    # The read-only call came after the write, so it must not overtake it
+    assert provider.ran_early == []
+    assert log == ["write+", "write-", "sleep+", "sleep-"]
+
+
+async def test_identical_request_is_served_from_prompt_cache(workspace: Path) -> None:
+    usage = {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12}
+    loop = make_loop(workspace, [LLMResponse(content="answer", usage=usage)])
+    # Keep the clock in the system prompt from changing the request
+    loop.context.build_system_prompt = lambda *args, **kwargs: "system"
+
+    # Two fresh sessions send the same first message, so the requests match
+    for chat_id in ("a", "b"):
+        out = await loop._process_message(
+            InboundMessage(channel="test", sender_id="u", chat_id=chat_id, content="hi")
+        )
+        assert out.content == "answer"
+    assert len(loop.provider.calls) == 1
+
+    total = loop.usage_tracker.get_total()
+    assert (total["total_tokens"], total["cached_tokens"], total["saved_tokens"]) == (12, 0, 12)
+
+
+async def test_turn_timeout_returns_graceful_reply(workspace: Path) -> None:
+    provider = GatedProvider()
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=workspace, max_turn_seconds=0.05
+    )
+    assert "timed out after 0.05s" in await loop.process_direct("slow")
+
+
+async def test_turn_timeout_still_records_usage(workspace: Path) -> None:
+    call = ToolCallRequest(id="1", name="sleep", arguments={"secs": 5})
+    usage = {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12}
+    loop = make_loop(
+        workspace, [LLMResponse(content=None, tool_calls=[call], usage=usage)],
+        max_turn_seconds=0.05,
+    )
+    loop.tools.register(SleepTool())
+
+    assert "timed out" in await loop.process_direct("go")
+    assert loop.usage_tracker.get_session_total("cli:direct") == 12
+
+
+async def test_session_saved_in_background_after_reply(workspace: Path) -> None:
+    loop = make_loop(workspace, [LLMResponse(content="hi")])
+    assert await loop.process_direct("hello") == "hi"
+
+    await loop.drain()
+    path = loop.sessions._get_session_path("cli:direct")
+    assert path.exists()
+    assert "hello" in path.read_text()
+
+
+async def test_next_message_waits_for_background_save(workspace: Path) -> None:
+    log: list[str] = []
+    loop = make_loop(workspace, [LLMResponse(content="a"), LLMResponse(content="b")])
+    chat = loop.provider.chat
+    save = loop.sessions.save
+
+    async def logged_chat(*args: Any, **kwargs: Any) -> LLMResponse:
+        log.append("chat")
+        return await chat(*args, **kwargs)
+
+    def slow_save(session: Any) -> None:
+        log.append("save")
+        time.sleep(0.05)
+        save(session)
+        log.append("saved")
+
+    loop.provider.chat = logged_chat
+    loop.sessions.save = slow_save
+    # Both messages are queued on the session lock before the first save starts
+    await asyncio.gather(*(
+        loop._dispatch(InboundMessage(channel="test", sender_id="u", chat_id="c", content=text))
+        for text in ("one", "two")
+    ))
+    await loop.drain()
+    assert log == ["chat", "save", "saved", "chat", "save", "saved"]
+
+
+async def test_system_message_routes_to_origin_session(workspace: Path) -> None:
+    loop = make_loop(workspace, [LLMResponse(content="summary")])
+    out = await loop._process_message(
+        InboundMessage(channel="system", sender_id="subagent", chat_id="telegram:42", content="done")
+    )
+    assert (out.channel, out.chat_id, out.content) == ("telegram", "42", "summary")
+    history = loop.sessions.get_or_create("telegram:42").get_history()
+    assert history[0]["content"] == "[System: subagent] done"
+
+
+async def test_system_message_locks_its_origin_session(workspace: Path) -> None:
+    loop = make_loop(workspace, [LLMResponse(content="summary")])
+    held: list[str] = []
+    process = loop._process_message
+
+    async def record_locks(msg: InboundMessage) -> Any:
+        held.extend(key for key, lock in loop._session_locks.items() if lock.locked())
+        return await process(msg)
+
+    loop._process_message = record_locks
+    # A bare chat_id falls back to the cli channel, same as the reply routing
+    await loop._dispatch(
+        InboundMessage(channel="system", sender_id="subagent", chat_id="direct", content="done")
+    )
+    out = await loop.bus.consume_outbound()
+    assert (out.channel, out.chat_id) == ("cli", "direct")
+    assert held == ["cli:direct"]
+
+
+async def test_session_locks_are_released_when_idle(workspace: Path) -> None:
+    loop = make_loop(workspace, [LLMResponse(content="a"), LLMResponse(content="b")])
+    await asyncio.gather(loop.process_direct("one"), loop.process_direct("two"))
+    await loop.drain()
+    assert len(loop._session_locks) == 0
@@ -0,0 +1,10 @@
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+
+
+def test_system_prompt_keeps_current_time_last(tmp_path: Path) -> None:
+    prompt = ContextBuilder(tmp_path).build_system_prompt()
+    assert prompt.startswith("# nanobot")
+    head, _, tail = prompt.rpartition("# Current Time\n")
+    assert head and "\n" not in tail
@@ -0,0 +1,164 @@
+from typing import Any
+
+import pytest
+from litellm.types.utils import (
+    ChatCompletionDeltaToolCall,
+    Delta,
+    Function,
+    ModelResponseStream,
+    StreamingChoices,
+    Usage,
+)
+
+from nanobot.providers import litellm_provider
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+def tool_delta(
+    index: int, id: str | None = None, name: str | None = None, args: str = ""
+) -> ChatCompletionDeltaToolCall:
+    return ChatCompletionDeltaToolCall(
+        index=index, id=id, type="function" if id else None,
+        function=Function(name=name, arguments=args),
+    )
+
+
+def chunk(
+    tool_calls: list[ChatCompletionDeltaToolCall] | None = None,
+    content: str | None = None,
+    finish_reason: str | None = None,
+) -> ModelResponseStream:
+    return ModelResponseStream(
+        id="c1", model="gpt-4o",
+        choices=[StreamingChoices(
+            index=0, delta=Delta(content=content, tool_calls=tool_calls),
+            finish_reason=finish_reason,
+        )],
+    )
+
+
+def usage_chunk(prompt: int, completion: int) -> ModelResponseStream:
+    # With include_usage, usage arrives in a final chunk without choices
+    return ModelResponseStream(
+        id="c1", model="gpt-4o", choices=[],
+        usage=Usage(prompt_tokens=prompt, completion_tokens=completion,
+                    total_tokens=prompt + completion),
+    )
+
+
+@pytest.fixture
+def fake_stream(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    """Replace acompletion with a stream of the chunks (or error) put in the returned dict."""
+    state: dict[str, Any] = {"chunks": [], "error": None, "kwargs": None}
+
+    async def acompletion(**kwargs: Any) -> Any:
+        state["kwargs"] = kwargs
+
+        async def stream():
+            for c in state["chunks"]:
+                yield c
+            if state["error"] is not None:
+                raise state["error"]
+
+        return stream()
+
+    monkeypatch.setattr(litellm_provider, "acompletion", acompletion)
+    return state
+
+
+async def collect(provider: LiteLLMProvider) -> list[ToolCallRequest | LLMResponse]:
+    messages = [{"role": "user", "content": "hi"}]
+    return [item async for item in provider.chat_stream(messages, model="gpt-4o")]
+
+
+async def test_stream_assembles_split_tool_calls_and_usage(fake_stream: dict[str, Any]) -> None:
+    fake_stream["chunks"] = [
+        chunk([tool_delta(0, "a", "read_file", '{"pa')]),
+        chunk([tool_delta(0, args='th": "x"}')]),
+        chunk([tool_delta(1, "b", "list_dir", "{}")]),
+        chunk(finish_reason="tool_calls"),
+        usage_chunk(5, 3),
+    ]
+    items = await collect(LiteLLMProvider())
+
+    assert items[:2] == [
+        ToolCallRequest(id="a", name="read_file", arguments={"path": "x"}),
+        ToolCallRequest(id="b", name="list_dir", arguments={}),
+    ]
+    response = items[-1]
+    assert len(items) == 3 and isinstance(response, LLMResponse)
+    assert response.tool_calls == items[:2]
+    assert response.finish_reason == "tool_calls"
+    assert response.usage == {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8}
+
+
+async def test_stream_new_id_at_same_index_starts_next_call(fake_stream: dict[str, Any]) -> None:
+    fake_stream["chunks"] = [
+        chunk([tool_delta(0, "a", "read_file", '{"path": "x"}')]),
+        chunk([tool_delta(0, "b", "read_file", '{"path": "y"}')]),
+        chunk(finish_reason="tool_calls"),
+    ]
+    items = await collect(LiteLLMProvider())
+
+    assert [(i.id, i.arguments) for i in items[:2]] == [("a", {"path": "x"}), ("b", {"path": "y"})]
+    assert isinstance(items[-1], LLMResponse)
+
+
+async def test_stream_text_only_response(fake_stream: dict[str, Any]) -> None:
+    fake_stream["chunks"] = [chunk(content="hel"), chunk(content="lo", finish_reason="stop")]
+    items = await collect(LiteLLMProvider())
+
+    assert len(items) == 1
+    assert items[0].content == "hello" and not items[0].has_tool_calls
+
+
+async def test_stream_error_becomes_error_response(fake_stream: dict[str, Any]) -> None:
+    fake_stream["chunks"] = [chunk([tool_delta(0, "a", "read_file", '{"pa')])]
+    fake_stream["error"] = RuntimeError("connection reset")
+    items = await collect(LiteLLMProvider())
+
+    assert len(items) == 1 and isinstance(items[0], LLMResponse)
+    assert items[0].finish_reason == "error"
+    assert "connection reset" in items[0].content
+
+
+async def test_stream_requests_usage_only_where_supported(fake_stream: dict[str, Any]) -> None:
+    fake_stream["chunks"] = [chunk(content="ok", finish_reason="stop")]
+    provider = LiteLLMProvider()
+    messages = [{"role": "user", "content": "hi"}]
+
+    [_ async for _ in provider.chat_stream(messages, model="gpt-4o")]
+    assert fake_stream["kwargs"]["stream_options"] == {"include_usage": True}
+
+    [_ async for _ in provider.chat_stream(messages, model="anthropic/claude-opus-4-5")]
+    assert "stream_options" not in fake_stream["kwargs"]
+
+
+def test_build_tool_call_keeps_unparseable_arguments() -> None:
+    call = LiteLLMProvider._build_tool_call(
+        {"index": 0, "id": None, "name": "exec", "arguments": '{"cmd": '}
+    )
+    assert call == ToolCallRequest(id="", name="exec", arguments={"raw": '{"cmd": '})
+
+
+def test_anthropic_system_prompt_gets_cache_breakpoint_before_current_time() -> None:
+    system = "identity\n\n---\n\n# Skills\n\n---\n\n# Current Time\n2026-01-01 10:00"
+    messages = [{"role": "system", "content": system}, {"role": "user", "content": "hi"}]
+    kwargs = LiteLLMProvider()._build_kwargs(messages, None, "anthropic/claude-opus-4-5", 100, 0.7)
+
+    blocks = kwargs["messages"][0]["content"]
+    assert blocks == [
+        {"type": "text", "text": "identity\n\n---\n\n# Skills",
+         "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "\n\n---\n\n# Current Time\n2026-01-01 10:00"},
+    ]
+    assert "".join(b["text"] for b in blocks) == system
+    assert kwargs["messages"][1:] == messages[1:]
+    assert messages[0]["content"] == system  # caller's list is untouched
+
+
+def test_other_models_keep_plain_system_prompt() -> None:
+    messages = [{"role": "system", "content": "a\n\n---\n\nb"}]
+    kwargs = LiteLLMProvider()._build_kwargs(messages, None, "gpt-4o", 100, 0.7)
+    assert kwargs["messages"] is messages
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from nanobot.agent.memory import MemoryStore
+
+
+def test_reads_are_cached_until_file_changes(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    assert store.read_long_term() == ""
+
+    store.write_long_term("fact one")
+    assert store.read_long_term() == "fact one"
+    assert store.memory_file in store._read_cache
+
+    # External edits (e.g. by the write_file tool) are picked up
+    store.memory_file.write_text("fact one\nfact two", encoding="utf-8")
+    assert store.read_long_term() == "fact one\nfact two"
+
+
+def test_append_today_adds_header_once(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    assert store.get_today_file() is store.get_today_file()
+
+    store.append_today("first")
+    store.append_today("second")
+    content = store.read_today()
+    assert content.startswith("# ")
+    assert content.count("# ") == 1
+    assert content.endswith("first\nsecond")
+
+
+def test_get_recent_memories_reads_existing_days(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_today("today's note")
+    (store.memory_dir / "2000-01-01.md").write_text("ancient", encoding="utf-8")
+
+    recent = store.get_recent_memories(days=3)
+    assert "today's note" in recent
+    assert "ancient" not in recent
+    assert store.get_recent_memories(days=3) == recent
+
+
+def test_list_memory_files_newest_first(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    for name in ["2026-01-02.md", "2025-12-31.md", "2026-01-10.md", "MEMORY.md", "notes-1.md"]:
+        (store.memory_dir / name).write_text("x", encoding="utf-8")
+
+    assert [p.name for p in store.list_memory_files()] == [
+        "2026-01-10.md", "2026-01-02.md", "2025-12-31.md",
+    ]
+
+
+def test_list_memory_files_sees_new_files(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    assert store.list_memory_files() == []
+
+    store.append_today("note")
+    (store.memory_dir / "2001-01-01.md").write_text("old", encoding="utf-8")
+    names = [p.name for p in store.list_memory_files()]
+    assert names[0] == store.get_today_file().name
+    assert "2001-01-01.md" in names
+
+
+def test_get_recent_memories_window_is_newest_first(tmp_path: Path) -> None:
+    from datetime import date, timedelta
+
+    store = MemoryStore(tmp_path)
+    today = date.today()
+    for offset in (0, 2, 5):
+        day = (today - timedelta(days=offset)).isoformat()
+        (store.memory_dir / f"{day}.md").write_text(f"day-{offset}", encoding="utf-8")
+
+    assert store.get_recent_memories(days=3) == "day-0\n\n---\n\nday-2"
+    assert store.get_recent_memories(days=0) == ""
+
+
+def test_today_file_follows_date_rollover(tmp_path: Path, monkeypatch) -> None:
+    import nanobot.agent.memory as memory
+
+    store = MemoryStore(tmp_path)
+    first = store.get_today_file()
+    assert first.name == f"{memory.today_date()}.md"
+
+    # Pretend the clock has moved past midnight
+    start, end = store._today_bounds
+    monkeypatch.setattr(memory, "today_date", lambda: "2099-01-01")
+    monkeypatch.setattr(memory.time, "time", lambda: end + 1)
+    assert store.get_today_file().name == "2099-01-01.md"
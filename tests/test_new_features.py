@@ -38,6 +38,76 @@ def test_usage_tracker():
         print("✓ Usage tracker test passed")
 
 
+def test_usage_tracker_batch_and_flush():
+    """Test batched usage tracking defers disk writes until flushed."""
+    import tempfile
+    from pathlib import Path
+
+    from nanobot.usage.tracker import UsageTracker
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tracker = UsageTracker(data_dir=Path(tmpdir))
+        entry = {"session_key": "test:session", "model": "test-model",
+                 "prompt_tokens": 10, "completion_tokens": 5}
+        
+        tracker.track_batch([entry, entry, {**entry, "cached_tokens": 7, "saved_tokens": 3}])
+        assert tracker.get_session("test:session")["total_tokens"] == 45
+        assert tracker.get_total()["cached_tokens"] == 7
+        assert tracker.get_total()["saved_tokens"] == 3
+        assert not tracker.stats_file.exists()
+        
+        tracker.flush()
+        assert UsageTracker(data_dir=Path(tmpdir)).get_total()["call_count"] == 3
+        
+        print("✓ Usage tracker batch test passed")
+
+
+def test_json_helpers_roundtrip():
+    """Test JSON helpers match stdlib semantics with or without orjson."""
+    import json
+
+    from nanobot.utils.helpers import json_dumps, json_loads
+    
+    data = {"path": "café/a.md", "n": 3, "nested": [1, None, True]}
+    assert json_loads(json_dumps(data)) == data
+    # Non-str keys fall back to the stdlib encoder
+    assert json_loads(json_dumps({1: "a"})) == {"1": "a"}
+    try:
+        json_loads("{not json")
+        assert False, "expected JSONDecodeError"
+    except json.JSONDecodeError:
+        pass
+
+
+def test_canonical_json_is_key_order_independent():
+    """canonical_json() sorts keys and stringifies unknown types."""
+    from datetime import date
+
+    from nanobot.utils.helpers import canonical_json
+    
+    assert canonical_json({"b": 1, "a": [2]}) == canonical_json({"a": [2], "b": 1})
+    assert b"2026-01-01" in canonical_json({"d": date(2026, 1, 1)})
+    
+    # Mixed key types; the >64-bit int makes orjson defer to the stdlib path
+    big = 2 ** 70
+    assert canonical_json({"b": big, 1: "a", None: 0}) == (
+        b'{"1": "a", "b": ' + str(big).encode() + b', "null": 0}'
+    )
+
+
+def test_usage_record_to_dict_matches_asdict():
+    """UsageRecord.to_dict() mirrors dataclasses.asdict()."""
+    from dataclasses import asdict
+
+    from nanobot.usage.tracker import UsageRecord
+
+    record = UsageRecord(
+        timestamp="2026-01-01T00:00:00", session_key="s", model="m",
+        prompt_tokens=1, completion_tokens=2, total_tokens=3, metadata={"k": "v"},
+    )
+    assert record.to_dict() == asdict(record)
+
+
 def test_ollama_provider_import():
     """Test that Ollama provider can be imported."""
     try:
@@ -89,6 +159,14 @@ def test_config_schema():
     assert hasattr(config.tools.web, "ollama_search")
     assert isinstance(config.tools.web.ollama_search, OllamaWebSearchConfig)
     print("✓ OllamaWebSearchConfig in schema")
+    
+    # Check agent loop tuning defaults
+    defaults = config.agents.defaults
+    assert defaults.prompt_cache_size == 128
+    assert defaults.max_concurrent_messages == 4
+    assert defaults.max_turn_seconds == 300
+    assert defaults.stream_tool_calls is False
+    print("✓ Agent loop settings in schema")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+from nanobot.providers.base import LLMResponse
+from nanobot.providers.cache import PromptCache
+
+
+def test_make_key_is_order_insensitive_for_dict_keys() -> None:
+    a = PromptCache.make_key([{"role": "user", "content": "hi"}], None, "m")
+    b = PromptCache.make_key([{"content": "hi", "role": "user"}], None, "m")
+    assert a == b
+    assert a != PromptCache.make_key([{"role": "user", "content": "hi"}], None, "other")
+
+
+def test_get_put_and_lru_eviction() -> None:
+    cache = PromptCache(max_entries=2)
+    cache.put("a", LLMResponse(content="A"))
+    cache.put("b", LLMResponse(content="B"))
+    assert cache.get("a").content == "A"
+
+    cache.put("c", LLMResponse(content="C"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+    assert cache.hits == 2 and cache.misses == 1
+
+
+def test_error_responses_are_not_cached() -> None:
+    cache = PromptCache()
+    cache.put("k", LLMResponse(content="Error calling LLM", finish_reason="error"))
+    assert cache.get("k") is None
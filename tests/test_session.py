@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+from nanobot.session.manager import Session, SessionManager
+
+
+def test_session_history_tracks_messages() -> None:
+    session = Session(key="t:1", messages=[{"role": "user", "content": "a", "timestamp": "x"}])
+    session.add_message("assistant", "b")
+    assert session.get_history() == [
+        {"role": "user", "content": "a"},
+        {"role": "assistant", "content": "b"},
+    ]
+    assert session.get_history(max_messages=1) == [{"role": "assistant", "content": "b"}]
+
+    session.clear()
+    assert session.get_history() == []
+
+
+def test_session_round_trips_through_disk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Sessions live under ~/.nanobot
+    monkeypatch.setenv("HOME", str(tmp_path))
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:rt")
+    session.add_message("user", "héllo ✓")
+    session.metadata["lang"] = "fr"
+    manager.save(session)
+
+    loaded = SessionManager(tmp_path).get_or_create("test:rt")
+    assert loaded.get_history() == [{"role": "user", "content": "héllo ✓"}]
+    assert loaded.metadata == {"lang": "fr"}
@@ -1,5 +1,8 @@
+import asyncio
 from typing import Any
 
+import pytest
+
 from nanobot.agent.tools.base import Tool
 from nanobot.agent.tools.registry import ToolRegistry
 
@@ -86,3 +89,46 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+def test_registry_definitions_cached_until_tools_change() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    defs = reg.get_definitions()
+    assert reg.get_definitions() is defs
+
+    reg.unregister("sample")
+    assert reg.get_definitions() == []
+
+
+class ContextEchoTool(SampleTool):
+    @property
+    def name(self) -> str:
+        return "echo_context"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        await asyncio.sleep(0.01)
+        return self.context.get("chat_id", "none")
+
+
+async def test_registry_context_is_isolated_per_call() -> None:
+    reg = ToolRegistry()
+    reg.register(ContextEchoTool())
+    results = await asyncio.gather(
+        reg.execute("echo_context", {}, {"chat_id": "a"}),
+        reg.execute("echo_context", {}, {"chat_id": "b"}),
+        reg.execute("echo_context", {}),
+    )
+    assert results == ["a", "b", "none"]
+
+
+def test_tool_context_is_read_only_and_empty_outside_calls() -> None:
+    tool = ContextEchoTool()
+    assert dict(tool.context) == {}
+    with pytest.raises(TypeError):
+        tool.context["chat_id"] = "leak"
+    assert dict(ContextEchoTool().context) == {}